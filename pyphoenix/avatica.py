@@ -25,6 +25,7 @@ import http.client
 from pyphoenix import errors
 import math
 import time
+import threading
 from importlib import import_module
 
 __all__ = ['AvaticaClient']
@@ -63,6 +64,9 @@ class AvaticaClient(object):
         self.autocommit = autocommit
         self.readonly = readonly
         self.timeout = timeout if timeout is not None else 100000
+        # The HTTP connection is shared by all cursors and the threads
+        # prefetching frames for them, so only one request can be in flight.
+        self._lock = threading.RLock()
 
     def connect(self):
         """Opens a HTTP connection to the RPC server."""
@@ -70,18 +74,21 @@ class AvaticaClient(object):
         try:
             self.connection = http.client.HTTPConnection(self.url.hostname, self.url.port)
             self.connection.connect()
+            # Don't let Nagle's algorithm delay small back-to-back requests
+            self.connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
         except (http.client.HTTPException, socket.error) as e:
             raise errors.InterfaceError('Unable to connect to the specified service', e)
 
     def close(self):
         """Closes the HTTP connection to the RPC server."""
-        if self.connection is not None:
-            logger.debug("Closing connection to %s:%s", self.url.hostname, self.url.port)
-            try:
-                self.connection.close()
-            except http.client.HTTPException:
-                logger.warning("Error while closing connection", exc_info=True)
-            self.connection = None
+        with self._lock:
+            if self.connection is not None:
+                logger.debug("Closing connection to %s:%s", self.url.hostname, self.url.port)
+                try:
+                    self.connection.close()
+                except http.client.HTTPException:
+                    logger.warning("Error while closing connection", exc_info=True)
+                self.connection = None
 
     def _apply(self,  request_data):
 
@@ -91,8 +98,9 @@ class AvaticaClient(object):
 
         body = wire_message.SerializeToString()
         headers = {'content-type': 'application/x-google-protobuf'}
-        response = self._post_request(body, headers)
-        response_body = response.read()
+        with self._lock:
+            response = self._post_request(body, headers)
+            response_body = response.read()
 
         # deserialize WireMessage
         wire_message = WireMessage()
@@ -191,7 +199,8 @@ class AvaticaClient(object):
         return self._apply(request).statement_id
 
     def closeStatement(self, connectionId, statementId):
-        request = CloseStatementRequest(connection_id=connectionId)
+        request = CloseStatementRequest(connection_id=connectionId,
+                                        statement_id=statementId)
         self._apply(request)
 
     def prepareAndExecute(self, connectionId, statementId, sql, maxRowCount=-1):
@@ -219,6 +228,13 @@ class AvaticaClient(object):
                                  first_frame_max_size=maxRowCount)
         return self._apply(request).results
 
+    def executeBatch(self, connectionId, statementId, parameterValues):
+        updates = [UpdateBatch(parameter_values=values) for values in parameterValues]
+        request = ExecuteBatchRequest(connection_id=connectionId,
+                                      statement_id=statementId,
+                                      updates=updates)
+        return self._apply(request).update_counts
+
     def fetch(self, connectionId, statementId, offset=0, fetchMaxRowCount=-1):
         request = FetchRequest(connection_id=connectionId,
                                             statement_id=statementId,
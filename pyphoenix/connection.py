@@ -13,8 +13,10 @@
 # limitations under the License.
 
 import logging
+import threading
 import uuid
 import weakref
+from concurrent.futures import ThreadPoolExecutor
 from pyphoenix import errors
 from pyphoenix.cursor import Cursor
 from pyphoenix.errors import ProgrammingError
@@ -25,6 +27,56 @@ __all__ = ['Connection']
 logger = logging.getLogger(__name__)
 
 
+class _StatementCloser(object):
+    """Closes statements on the connection's thread pool.
+
+    It holds no reference to the connection, so that the connection can
+    never be finalized, and shut down its pool, on one of the pool's threads.
+    """
+
+    def __init__(self, client, connection_id):
+        self._client = client
+        self._connection_id = connection_id
+        self._lock = threading.Lock()
+        self._statement_ids = []
+        self._scheduled = False
+
+    def add(self, statement_id, io_pool):
+        with self._lock:
+            self._statement_ids.append(statement_id)
+            schedule = io_pool is not None and not self._scheduled
+            if schedule:
+                self._scheduled = True
+        if io_pool is None:
+            self.run()
+        elif schedule:
+            try:
+                io_pool.submit(self.run)
+            except RuntimeError:
+                # the interpreter is shutting down
+                self.run()
+
+    def clear(self):
+        with self._lock:
+            del self._statement_ids[:]
+
+    def run(self):
+        try:
+            while True:
+                with self._lock:
+                    if not self._statement_ids:
+                        self._scheduled = False
+                        return
+                    statement_id = self._statement_ids.pop(0)
+                try:
+                    self._client.closeStatement(self._connection_id, statement_id)
+                except Exception:
+                    logger.warning("Error while closing statement %s", statement_id, exc_info=True)
+        finally:
+            with self._lock:
+                self._scheduled = False
+
+
 class Connection(object):
     """Database connection.
     
@@ -35,7 +87,9 @@ class Connection(object):
         self._client = client
         self._closed = False
         self._cursors = []
+        self._io_pool = ThreadPoolExecutor(max_workers=4)
         self.open()
+        self._statement_closer = _StatementCloser(client, self._id)
         self.set_session(**kwargs)
 
     def __del__(self):
@@ -68,10 +122,30 @@ class Connection(object):
             cursor = cursor_ref()
             if cursor is not None and not cursor._closed:
                 cursor.close()
+        # Closing the connection releases all of its statements on the server
+        self._statement_closer.clear()
+        self.close_pool()
         self._client.closeConnection(self._id)
         self._client.close()
         self._closed = True
 
+    def _close_statement_async(self, statement_id):
+        # Statements are closed in the background, so that closing a cursor
+        # does not wait for a round-trip to the server.
+        self._statement_closer.add(statement_id, self._io_pool)
+
+    def close_pool(self):
+        """Shuts down the thread pool used for background requests,
+        waiting for the requests that are already running.
+
+        Cursors then fetch frames and close statements synchronously.
+        This is done automatically by :meth:`close`.
+        """
+        if self._io_pool is not None:
+            self._io_pool.shutdown(wait=True)
+            self._io_pool = None
+        self._statement_closer.run()
+
     @property
     def closed(self):
         """Read-only attribute specifying if the connection is closed or not."""
@@ -14,16 +14,89 @@
 
 import logging
 import collections
-from pyphoenix.errors import InternalError, ProgrammingError
+from concurrent.futures import wait
+try:
+    from weakref import finalize
+except ImportError:
+    from backports.weakref import finalize
+from pyphoenix.errors import InternalError, NotSupportedError, ProgrammingError
 from .common_pb2 import Rep, TypedValue
-from .types import javaTypetoNative
+from .types import int_from_java_big_decimal, javaTypetoNative, typedValueToNative
 
 __all__ = ['Cursor', 'ColumnDescription']
 
 logger = logging.getLogger(__name__)
 
-ColumnDescription = collections.namedtuple('ColumnDescription', 'name type_code display_size internal_size precision scale null_ok')
-"""Named tuple for representing results from :attr:`Cursor.description`."""
+class ColumnDescription(object):
+    """Column metadata, as found in :attr:`Cursor.description`.
+
+    Besides the attributes, it behaves like the 7-item sequence required by DB API 2.0.
+    """
+
+    __slots__ = ('name', 'type_code', 'display_size', 'internal_size', 'precision', 'scale', 'null_ok')
+
+    _fields = __slots__
+
+    def __init__(self, name, type_code, display_size, internal_size, precision, scale, null_ok):
+        self.name = name
+        self.type_code = type_code
+        self.display_size = display_size
+        self.internal_size = internal_size
+        self.precision = precision
+        self.scale = scale
+        self.null_ok = null_ok
+
+    def _astuple(self):
+        return (self.name, self.type_code, self.display_size, self.internal_size,
+                self.precision, self.scale, self.null_ok)
+
+    def _asdict(self):
+        return collections.OrderedDict(zip(self.__slots__, self._astuple()))
+
+    def _replace(self, **kwargs):
+        values = self._asdict()
+        values.update(kwargs)
+        return ColumnDescription(**values)
+
+    def __iter__(self):
+        for name in self.__slots__:
+            yield getattr(self, name)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(getattr(self, name) for name in self.__slots__[index])
+        return getattr(self, self.__slots__[index])
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __eq__(self, other):
+        if isinstance(other, ColumnDescription):
+            other = other._astuple()
+        return self._astuple() == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._astuple())
+
+    def __repr__(self):
+        return 'ColumnDescription({})'.format(', '.join(
+            '{}={!r}'.format(name, getattr(self, name)) for name in self.__slots__))
+
+_NUMPY_DTYPES = {
+    'FLOAT': 'float64',
+    'DOUBLE': 'float64',
+    'LONG': 'int64',
+    'INTEGER': 'int64',
+    'SHORT': 'int64',
+    'BOOLEAN': 'bool',
+}
+"""Maps column reps to the numpy dtypes used by :meth:`Cursor.fetchall_columnar`."""
+
+_NULL_OK = (False, True, None)
+"""Maps JDBC's ``columnNoNulls``, ``columnNullable`` and ``columnNullableUnknown`` to ``null_ok`` values."""
 
 
 
@@ -42,28 +115,62 @@ class Cursor(object):
     fetch a single row at a time.
     """
 
+    batchsize = 1000
+    """
+    Read/write attribute specifying the maximum number of parameter
+    sets sent to the backend in a single request by :meth:`executemany`.
+    The default is 1000.
+    """
+
     itersize = 2000
     """
     Read/write attribute specifying the number of rows to fetch
     from the backend at each network roundtrip during iteration
-    on the cursor. The default is 2000.
+    on the cursor. The default is 2000. While it is left at the
+    default, the frames after the first one of each result set are
+    sized by :attr:`fetch_bytes` instead.
+    """
+
+    fetch_bytes = 512 * 1024
+    """
+    Read/write attribute specifying the approximate size in bytes of
+    the frames to fetch from the backend during iteration. After the first
+    frame of a result set arrives, the number of rows in the following
+    frames is computed from the average size of its rows. It is only used
+    if :attr:`itersize` is left at its default; set it to ``None`` to always
+    use :attr:`itersize`. The default is 512 KiB.
     """
 
     def __init__(self, connection, id=None):
         self._connection = connection
         self._id = id
+        # Shared with the finalizer, which must not keep a reference to the cursor
+        self._statement = [id]
+        self._finalizer = finalize(self, Cursor._finalize, connection, self._statement)
+        self._finalizer.atexit = False
+        self._prepared = None
         self._signature = None
+        self._description = None
         self._column_data_types = []
+        self._plain_columns = False
         self._frame = None
+        self._rows = None
+        self._row_count = 0
+        self._done = True
         self._pos = None
+        self._next_frame_future = None
+        self._frame_size = self.itersize
         self._closed = False
         self.arraysize = self.__class__.arraysize
+        self.batchsize = self.__class__.batchsize
         self.itersize = self.__class__.itersize
+        self.fetch_bytes = self.__class__.fetch_bytes
         self._updatecount = -1
 
-    def __del__(self):
-        if not self._connection._closed and not self._closed:
-            self.close()
+    @staticmethod
+    def _finalize(connection, statement):
+        if statement[0] is not None and not connection._closed:
+            connection._close_statement_async(statement[0])
 
     def __enter__(self):
         return self
@@ -76,11 +183,18 @@ class Cursor(object):
         return self
 
     def next(self):
-        row = self.fetchone()
-        if row is None:
+        # Same as fetchone(), but without the extra call and None check
+        pos = self._pos
+        if pos is None:
+            if self._frame is None:
+                raise ProgrammingError('no select statement was executed')
             raise StopIteration
+        row = self._rows[pos]
+        self._advance(pos + 1)
         return row
 
+    __next__ = next
+
     def close(self):
         """Closes the cursor.
         No further operations are allowed once the cursor is closed.
@@ -90,13 +204,22 @@ class Cursor(object):
         """
         if self._closed:
             raise ProgrammingError('the cursor is already closed')
+        self._finalizer.detach()
         if self._id is not None:
-            self._connection._client.closeStatement(self._connection._id, self._id)
+            self._connection._close_statement_async(self._id)
             self._id = None
+            self._statement[0] = None
+        self._prepared = None
         self._signature = None
+        self._description = None
         self._column_data_types = []
+        self._plain_columns = False
         self._frame = None
+        self._rows = None
+        self._row_count = 0
+        self._done = True
         self._pos = None
+        self._next_frame_future = None
         self._closed = True
 
     @property
@@ -106,25 +229,14 @@ class Cursor(object):
 
     @property
     def description(self):
-        if self._signature is None:
-            return None
-        description = []
-        for column in self._signature.columns:
-            description.append(ColumnDescription(
-                column.column_name,
-                column.type.name,
-                column.display_size,
-                None,
-                column.precision,
-                column.scale,
-                bool(column.nullable),
-            ))
-        return description
+        return self._description
 
     def _set_id(self, id):
         if self._id is not None and self._id != id:
-            self._connection._client.closeStatement(self._connection._id, self._id)
+            self._connection._close_statement_async(self._id)
+            self._prepared = None
         self._id = id
+        self._statement[0] = id
 
     def _set_type(self, types, attribute_string, return_list):
         for column in types:
@@ -132,12 +244,31 @@ class Cursor(object):
 
     def _set_signature(self, signature):
         self._signature = signature
+        self._description = None
         self._column_data_types = []
+        self._plain_columns = False
         self._parameter_data_types = []
         if signature is None:
             return
 
+        self._description = [ColumnDescription(
+            column.column_name,
+            column.type.name,
+            column.display_size,
+            None,
+            column.precision,
+            column.scale,
+            _NULL_OK[column.nullable] if column.nullable < 3 else None,
+        ) for column in signature.columns]
+
         self._set_type(signature.columns, 'column_class_name', self._column_data_types)
+        for i, column in enumerate(signature.columns):
+            # Integral decimals are much cheaper to build as ints than through Decimal()
+            data_type = self._column_data_types[i]
+            if data_type[0] == 'BIG_DECIMAL' and column.scale == 0 and column.precision > 0:
+                self._column_data_types[i] = data_type[:3] + (int_from_java_big_decimal,)
+        self._plain_columns = bool(self._column_data_types) and all(
+            data_type[2] is not None and data_type[3] is None for data_type in self._column_data_types)
 
         self._set_type(signature.parameters, 'class_name', self._parameter_data_types)
 
@@ -159,20 +290,88 @@ class Cursor(object):
                 typed_parameters.append(v)
         return typed_parameters
 
+    def _convert_plain_rows(self, rows):
+        # Used when every column is read straight from its TypedValue field,
+        # which is simple enough to do row by row without any converters.
+        fields = [data_type[2] for data_type in self._column_data_types]
+        return [tuple([None if value.scalar_value.null else getattr(value.scalar_value, field)
+                       for value, field in zip(row.value, fields)]) for row in rows]
+
+    def _convert_columns(self, rows):
+        # Convert the frame column by column, so that each column's field
+        # and converter are resolved once.
+        columns = []
+        for i, data_type in enumerate(self._column_data_types):
+            values = [row.value[i].scalar_value for row in rows]
+            field, cast = data_type[2], data_type[3]
+            if field is None:
+                columns.append([None if v.null else typedValueToNative(v) for v in values])
+            elif cast is None:
+                columns.append([None if v.null else getattr(v, field) for v in values])
+            else:
+                columns.append([None if v.null else cast(getattr(v, field)) for v in values])
+        return columns
+
+    def _convert_rows(self, rows):
+        if not self._column_data_types:
+            return [() for row in rows]
+        return list(zip(*self._convert_columns(rows)))
+
     def _set_frame(self, frame):
+        if self._next_frame_future is not None:
+            # Let an abandoned prefetch finish before the statement is reused,
+            # so that it cannot move the server-side cursor of the next query.
+            wait([self._next_frame_future])
+            self._next_frame_future = None
         self._frame = frame
+        self._rows = None
+        self._row_count = 0
+        self._done = True
         self._pos = None
         if frame is not None:
+            self._done = frame.done
             if frame.rows:
+                if self._plain_columns:
+                    self._rows = self._convert_plain_rows(frame.rows)
+                else:
+                    self._rows = self._convert_rows(frame.rows)
+                self._row_count = len(self._rows)
                 self._pos = 0
             elif not frame.done:
                 raise InternalError('got an empty frame, but the statement is not done yet')
 
-    def _fetch_next_frame(self):
+    def _advance(self, pos):
+        # Moves to the given row of the current frame, fetching the next frame
+        # once this one is used up, and prefetching it once half of it is.
+        if pos >= self._row_count:
+            self._pos = None
+            if not self._done:
+                self._fetch_next_frame()
+        else:
+            self._pos = pos
+            if pos >= self._row_count // 2 and not self._done and self._next_frame_future is None:
+                self._prefetch_next_frame()
+
+    def _prefetch_next_frame(self):
+        # Request the next frame in the background, so that it is usually
+        # already available by the time the current one is consumed.
+        io_pool = self._connection._io_pool
+        if io_pool is None:
+            return
         offset = self._frame.offset + len(self._frame.rows)
-        frame = self._connection._client.fetch(self._connection._id, self._id,
-            offset=offset, fetchMaxRowCount=self.itersize)
-        self._set_frame(frame)
+        self._next_frame_future = io_pool.submit(self._connection._client.fetch,
+            self._connection._id, self._id, offset=offset, fetchMaxRowCount=self._frame_size)
+
+    def _request_next_frame(self):
+        if self._next_frame_future is not None:
+            future, self._next_frame_future = self._next_frame_future, None
+            return future.result()
+        offset = self._frame.offset + len(self._frame.rows)
+        return self._connection._client.fetch(self._connection._id, self._id,
+            offset=offset, fetchMaxRowCount=self._frame_size)
+
+    def _fetch_next_frame(self):
+        self._set_frame(self._request_next_frame())
 
     def _process_results(self, results):
         if results:
@@ -181,8 +380,29 @@ class Cursor(object):
                 self._set_id(result.statement_id)
             self._set_signature(result.signature)
             self._set_frame(result.first_frame)
+            self._frame_size = self._get_frame_size(result.first_frame)
             self._updatecount = result.update_count
 
+    def _get_frame_size(self, frame):
+        # An itersize set by the user always wins over fetch_bytes
+        if self.fetch_bytes is None or self.itersize != self.__class__.itersize or not frame.rows:
+            return self.itersize
+        sample = frame.rows[:50]
+        row_bytes = sum(row.ByteSize() for row in sample) // len(sample)
+        return max(1, self.fetch_bytes // max(1, row_bytes))
+
+    def _prepare(self, operation):
+        # Executing the same operation again reuses the prepared statement,
+        # which saves a round-trip for every repeated parametrized query.
+        if self._prepared is not None and self._prepared[0] == operation:
+            self._set_signature(self._prepared[1])
+            return
+        statement = self._connection._client.prepare(self._connection._id,
+            operation, maxRowCount=-1)
+        self._set_id(statement.id)
+        self._set_signature(statement.signature)
+        self._prepared = (operation, statement.signature)
+
     def execute(self, operation, parameters=None):
         if self._closed:
             raise ProgrammingError('the cursor is already closed')
@@ -191,14 +411,12 @@ class Cursor(object):
         if parameters is None or len(parameters) == 0:
             if self._id is None:
                 self._set_id(self._connection._client.createStatement(self._connection._id))
+            self._prepared = None
             results = self._connection._client.prepareAndExecute(self._connection._id, self._id,
                 operation, maxRowCount=-1)
             self._process_results(results)
         else:
-            statement = self._connection._client.prepare(self._connection._id,
-                operation, maxRowCount=-1)
-            self._set_id(statement.id)
-            self._set_signature(statement.signature)
+            self._prepare(operation)
             results = self._connection._client.execute(self._connection._id, self._id,self._signature,
                     self._transform_parameters(parameters), maxRowCount=self.itersize)
             self._process_results(results)
@@ -211,14 +429,12 @@ class Cursor(object):
         if parameters is None or len(parameters) == 0:
             if self._id is None:
                 self._set_id(self._connection._client.createStatement(self._connection._id))
+            self._prepared = None
             self._connection._client.prepareAndExecute(self._connection._id, self._id,
                 operation, maxRowCount=-1)
             self._connection._client.commitRequest(self._connection._id)
         else:
-            statement = self._connection._client.prepare(self._connection._id,
-                operation, maxRowCount=-1)
-            self._set_id(statement.id)
-            self._set_signature(statement.signature)
+            self._prepare(operation)
             self._connection._client.execute(self._connection._id, self._id,self._signature,
                     self._transform_parameters(parameters), maxRowCount=self.itersize)
             self._connection._client.commitRequest(self._connection._id)
@@ -228,59 +444,124 @@ class Cursor(object):
             raise ProgrammingError('the cursor is already closed')
         self._updatecount = -1
         self._set_frame(None)
-        statement = self._connection._client.prepare(self._connection._id, operation, maxRowCount=-1)
-        self._set_id(statement.id)
-        self._set_signature(statement.signature)
+        self._prepare(operation)
+        updatecount = 0
+        batch = []
         for parameters in seq_of_parameters:
-            self._connection._client.execute(self._connection._id, self._id, self._signature,
-                                             self._transform_parameters(parameters), maxRowCount=self.itersize)
+            batch.append(self._transform_parameters(parameters))
+            if len(batch) >= self.batchsize:
+                updatecount += self._execute_batch(batch)
+                batch = []
+        if batch:
+            updatecount += self._execute_batch(batch)
+        self._updatecount = updatecount
         self._connection._client.commitRequest(self._connection._id)
 
+    def _execute_batch(self, batch):
+        return sum(self._connection._client.executeBatch(self._connection._id, self._id, batch))
+
     def fetchone(self):
-        result_row = []
-        if self._frame is None:
-            raise ProgrammingError('no select statement was executed')
-        if self._pos is None:
+        pos = self._pos
+        if pos is None:
+            # _pos is always None while there is no frame
+            if self._frame is None:
+                raise ProgrammingError('no select statement was executed')
             return None
-        rows = self._frame.rows
-        row = rows[self._pos]
-        self._pos += 1
-        if self._pos >= len(rows):
-            self._pos = None
-            if not self._frame.done:
-                self._fetch_next_frame()
-        for value, data_type in zip(row.value, self._column_data_types):
-            if value.scalar_value.null:
-                result_row.append(None)
-            else:
-                if data_type[1] is not None:
-                    result_row.append(data_type[1](getattr(value.scalar_value, data_type[2])))
-                else:
-                    result_row.append(getattr(value.scalar_value, data_type[2]))
-
-        return tuple(result_row)
+        row = self._rows[pos]
+        self._advance(pos + 1)
+        return row
 
     def fetchmany(self, size=None):
         if size is None:
             size = self.arraysize
+        if self._frame is None:
+            raise ProgrammingError('no select statement was executed')
         rows = []
-        while size > 0:
-            row = self.fetchone()
-            if row is None:
-                break
-            rows.append(row)
-            size -= 1
+        while size > 0 and self._pos is not None:
+            chunk = self._rows[self._pos:self._pos + size]
+            rows.extend(chunk)
+            size -= len(chunk)
+            self._advance(self._pos + len(chunk))
         return rows
 
     def fetchall(self):
+        if self._frame is None:
+            raise ProgrammingError('no select statement was executed')
         rows = []
-        while True:
-            row = self.fetchone()
-            if row is None:
-                break
-            rows.append(row)
+        while self._pos is not None:
+            rows.extend(self._rows[self._pos:])
+            self._pos = None
+            if not self._done:
+                self._fetch_next_frame()
         return rows
 
+    def _fetchall_columns(self):
+        if self._frame is None:
+            raise ProgrammingError('no select statement was executed')
+        columns = [[] for data_type in self._column_data_types]
+        if self._pos is None:
+            return columns
+        # the current frame has already been converted to rows
+        for column, values in zip(columns, zip(*self._rows[self._pos:])):
+            column.extend(values)
+        self._rows = None
+        self._row_count = 0
+        self._pos = None
+        # the remaining frames are converted straight into columns
+        while not self._done:
+            frame = self._request_next_frame()
+            if not frame.rows and not frame.done:
+                raise InternalError('got an empty frame, but the statement is not done yet')
+            self._frame = frame
+            self._done = frame.done
+            if not self._done:
+                self._prefetch_next_frame()
+            for column, values in zip(columns, self._convert_columns(frame.rows)):
+                column.extend(values)
+        return columns
+
+    def fetchall_columnar(self):
+        """Fetches all remaining rows as a dictionary of numpy arrays,
+        keyed by column name.
+
+        Float columns are returned as ``float64`` arrays with NULLs as NaN,
+        integer and boolean columns as ``int64`` and ``bool`` arrays if they
+        contain no NULLs, and everything else as ``object`` arrays.
+        Raises :exc:`~pyphoenix.errors.ProgrammingError` without fetching
+        anything if two columns have the same name; use aliases in the query
+        to tell them apart. Requires numpy.
+        """
+        try:
+            import numpy
+        except ImportError:
+            raise NotSupportedError('fetchall_columnar() requires numpy')
+        if self._description is not None:
+            names = set()
+            for description in self._description:
+                if description.name in names:
+                    raise ProgrammingError('duplicate column name {!r}, use an alias'.format(description.name))
+                names.add(description.name)
+        columns = self._fetchall_columns()
+        result = collections.OrderedDict()
+        for description, data_type, column in zip(self._description, self._column_data_types, columns):
+            dtype = _NUMPY_DTYPES.get(data_type[0], object)
+            if dtype != 'float64' and None in column:
+                dtype = object
+            result[description.name] = numpy.array(column, dtype=dtype)
+        return result
+
+    def fetchall_arrow(self):
+        """Fetches all remaining rows as a :class:`pyarrow.RecordBatch`.
+        Requires pyarrow.
+        """
+        try:
+            import pyarrow
+        except ImportError:
+            raise NotSupportedError('fetchall_arrow() requires pyarrow')
+        columns = self._fetchall_columns()
+        arrays = [pyarrow.array(column) for column in columns]
+        return pyarrow.RecordBatch.from_arrays(arrays, [d.name for d in self._description])
+
     def setinputsizes(self, sizes):
         pass
 
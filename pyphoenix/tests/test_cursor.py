@@ -0,0 +1,103 @@
+import pyphoenix
+from decimal import Decimal
+from pyphoenix.cursor import Cursor
+from pyphoenix.tests import DatabaseTestCase
+
+
+class FetchTest(DatabaseTestCase):
+
+    num_rows = 25
+
+    def setUp(self):
+        DatabaseTestCase.setUp(self)
+        self.createTable("pyphoenix_test_tbl1", "id integer primary key, val varchar")
+        with self.conn.cursor() as cursor:
+            for i in range(self.num_rows):
+                cursor.execute("UPSERT INTO pyphoenix_test_tbl1 VALUES (?, ?)", [i, 'v{}'.format(i)])
+        self.expected = [(i, 'v{}'.format(i)) for i in range(self.num_rows)]
+
+    def execute(self, cursor):
+        # small frames, so that every fetch method has to cross frames and prefetch;
+        # only parametrized queries limit the size of the first frame
+        cursor.itersize = 3
+        cursor.execute("SELECT id, val FROM pyphoenix_test_tbl1 WHERE id >= ? ORDER BY id", [0])
+
+    def test_fetchone(self):
+        with self.conn.cursor() as cursor:
+            self.execute(cursor)
+            rows = []
+            while True:
+                row = cursor.fetchone()
+                if row is None:
+                    break
+                rows.append(row)
+            self.assertEqual(rows, self.expected)
+
+    def test_fetchmany(self):
+        with self.conn.cursor() as cursor:
+            self.execute(cursor)
+            rows = []
+            while True:
+                chunk = cursor.fetchmany(2)
+                if not chunk:
+                    break
+                rows.extend(chunk)
+            self.assertEqual(rows, self.expected)
+
+    def test_fetchall(self):
+        with self.conn.cursor() as cursor:
+            self.execute(cursor)
+            self.assertEqual(cursor.fetchall(), self.expected)
+
+    def test_iter(self):
+        with self.conn.cursor() as cursor:
+            self.execute(cursor)
+            self.assertEqual(list(cursor), self.expected)
+
+    def test_mixed(self):
+        with self.conn.cursor() as cursor:
+            self.execute(cursor)
+            rows = [cursor.fetchone()]
+            rows.extend(cursor.fetchmany(4))
+            rows.extend(list(cursor))
+            self.assertEqual(rows, self.expected)
+
+    def test_reexecute_during_prefetch(self):
+        with self.conn.cursor() as cursor:
+            self.execute(cursor)
+            # reading one row of a three row frame starts a prefetch
+            self.assertEqual(cursor.fetchone(), self.expected[0])
+            self.execute(cursor)
+            self.assertEqual(cursor.fetchall(), self.expected)
+
+    def test_fetch_bytes(self):
+        with self.conn.cursor() as cursor:
+            cursor.fetch_bytes = 1
+            cursor.execute("SELECT id, val FROM pyphoenix_test_tbl1 WHERE id >= ? ORDER BY id", [0])
+            self.assertEqual(cursor._frame_size, 1)
+            self.assertEqual(cursor.itersize, Cursor.itersize)
+            self.assertEqual(cursor.fetchall(), self.expected)
+
+    def test_fetch_bytes_explicit_itersize(self):
+        with self.conn.cursor() as cursor:
+            cursor.fetch_bytes = 1
+            self.execute(cursor)
+            self.assertEqual(cursor._frame_size, 3)
+            self.assertEqual(cursor.itersize, 3)
+            self.assertEqual(cursor.fetchall(), self.expected)
+
+
+class DecimalTest(DatabaseTestCase):
+
+    def test_integral(self):
+        self.createTable("pyphoenix_test_tbl1", "id integer primary key, val decimal(10,0)")
+        with self.conn.cursor() as cursor:
+            cursor.execute("UPSERT INTO pyphoenix_test_tbl1 VALUES (1, 1000)")
+            cursor.execute("UPSERT INTO pyphoenix_test_tbl1 VALUES (2, NULL)")
+            cursor.execute("UPSERT INTO pyphoenix_test_tbl1 VALUES (3, ?)", [Decimal('1000')])
+            cursor.execute("UPSERT INTO pyphoenix_test_tbl1 VALUES (4, ?)", [Decimal('-123')])
+            cursor.execute("SELECT id, val FROM pyphoenix_test_tbl1 ORDER BY id")
+            self.assertEqual(cursor.description[1].type_code, pyphoenix.NUMBER)
+            rows = cursor.fetchall()
+            self.assertEqual(rows, [(1, 1000), (2, None), (3, 1000), (4, -123)])
+            self.assertEqual([type(r[1]) for r in rows if r[1] is not None], [int, int, int])
@@ -35,6 +35,22 @@ class PhoenixDatabaseAPI20Test(dbapi20.DatabaseAPI20Test):
         finally:
             con.close()
 
+    def test_executemany_rowcount(self):
+        con = self._connect()
+        try:
+            cur = con.cursor()
+            self.executeDDL1(cur)
+            # several batches, the last one incomplete
+            cur.batchsize = 2
+            names = ['a', 'b', 'c', 'd', 'e']
+            cur.executemany('%s into %sbooze values (?)' % (self.insert, self.table_prefix),
+                [[name] for name in names])
+            self.assertEqual(cur.rowcount, len(names))
+            cur.execute('select name from %sbooze order by name' % self.table_prefix)
+            self.assertEqual([r[0] for r in cur.fetchall()], names)
+        finally:
+            con.close()
+
     def test_autocommit(self):
         con = dbapi20.DatabaseAPI20Test._connect(self)
         self.assertFalse(con.autocommit)
@@ -306,3 +306,58 @@ class TypesTest(DatabaseTestCase):
                 [2, [2,3]],
             ])
 
+
+    def createColumnarTable(self):
+        self.createTable("pyphoenix_test_tbl1", "id integer primary key, i bigint, f double, b boolean, n integer, s varchar")
+        with self.conn.cursor() as cursor:
+            cursor.execute("UPSERT INTO pyphoenix_test_tbl1 VALUES (1, 10, 1.5, TRUE, 1, 'a')")
+            cursor.execute("UPSERT INTO pyphoenix_test_tbl1 VALUES (2, 20, NULL, FALSE, NULL, NULL)")
+
+    def test_fetchall_columnar(self):
+        try:
+            import numpy
+        except ImportError:
+            raise unittest.SkipTest('fetchall_columnar() requires numpy')
+        self.createColumnarTable()
+        with self.conn.cursor() as cursor:
+            cursor.execute("SELECT id, i, f, b, n, s FROM pyphoenix_test_tbl1 ORDER BY id")
+            columns = cursor.fetchall_columnar()
+            self.assertEqual(list(columns), ['ID', 'I', 'F', 'B', 'N', 'S'])
+            self.assertEqual(columns['ID'].dtype, numpy.int64)
+            self.assertEqual(columns['I'].dtype, numpy.int64)
+            self.assertEqual(columns['I'].tolist(), [10, 20])
+            self.assertEqual(columns['F'].dtype, numpy.float64)
+            self.assertEqual(columns['F'][0], 1.5)
+            self.assertTrue(numpy.isnan(columns['F'][1]))
+            self.assertEqual(columns['B'].dtype, numpy.bool_)
+            self.assertEqual(columns['B'].tolist(), [True, False])
+            self.assertEqual(columns['N'].dtype, object)
+            self.assertEqual(columns['N'].tolist(), [1, None])
+            self.assertEqual(columns['S'].dtype, object)
+            self.assertEqual(columns['S'].tolist(), ['a', None])
+
+    def test_fetchall_columnar_duplicate_names(self):
+        try:
+            import numpy
+        except ImportError:
+            raise unittest.SkipTest('fetchall_columnar() requires numpy')
+        self.createColumnarTable()
+        with self.conn.cursor() as cursor:
+            cursor.execute("SELECT a.id, b.id FROM pyphoenix_test_tbl1 a JOIN pyphoenix_test_tbl1 b ON a.id = b.id")
+            self.assertRaises(pyphoenix.ProgrammingError, cursor.fetchall_columnar)
+            self.assertEqual(len(cursor.fetchall()), 2)
+
+    def test_fetchall_arrow(self):
+        try:
+            import pyarrow
+        except ImportError:
+            raise unittest.SkipTest('fetchall_arrow() requires pyarrow')
+        self.createColumnarTable()
+        with self.conn.cursor() as cursor:
+            cursor.execute("SELECT id, f, n, s FROM pyphoenix_test_tbl1 ORDER BY id")
+            batch = cursor.fetchall_arrow()
+            self.assertEqual(batch.num_rows, 2)
+            self.assertEqual(batch.schema.names, ['ID', 'F', 'N', 'S'])
+            self.assertEqual(batch.column(1).to_pylist(), [1.5, None])
+            self.assertEqual(batch.column(2).to_pylist(), [1, None])
+            self.assertEqual(batch.column(3).to_pylist(), ['a', None])
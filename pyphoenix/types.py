@@ -88,6 +88,19 @@ def datetime_to_java_sql_timestamp(d):
     td = d - datetime.datetime(1970, 1, 1)
     return td.microseconds / 1000 + (td.seconds + td.days * 24 * 3600) * 1000
 
+
+def int_from_java_big_decimal(s):
+    try:
+        return int(s)
+    except ValueError:
+        # BigDecimal.toString() uses exponent notation for negative scales, e.g. '1E+3'
+        from decimal import Decimal
+        value = Decimal(s)
+        if value != value.to_integral_value():
+            # never truncate a value the column's scale did not account for
+            return value
+        return int(value)
+
 class _BinaryString(str):
     pass
 
@@ -148,34 +161,38 @@ def typedValueToNative(v):
     else:
         return None
 
+JAVA_CLASSES = {
+    'java.lang.Float': ('FLOAT', float, "double_value", None),
+    'java.lang.Double': ('DOUBLE', None, "double_value", None),
+    'java.lang.Long': ('LONG', None, "number_value", None),
+    'java.lang.Integer': ('INTEGER', int, "number_value", None),
+    'java.lang.Short': ('SHORT', int, "number_value", None),
+    'java.lang.Byte': ('BYTE', Binary, "bytes_value", Binary),
+    'java.lang.Boolean': ('BOOLEAN', bool, "bool_value", None),
+    'java.lang.String': ('STRING', None, "string_value", None),
+    'java.sql.Time': ('JAVA_SQL_TIME', time_from_java_sql_time, "number_value", time_from_java_sql_time),
+    'java.sql.Date': ('JAVA_SQL_DATE', date_from_java_sql_date, "number_value", date_from_java_sql_date),
+    'java.sql.Timestamp': ('JAVA_SQL_TIMESTAMP', datetime_from_java_sql_timestamp, "number_value", datetime_from_java_sql_timestamp),
+    '[B': ('BYTE_STRING', Binary, "bytes_value", Binary),
+    #'org.apache.phoenix.schema.types.PhoenixArray': ('ARRAY', None, None, None),
+}
+"""Maps Java class names to ``(rep, parameter converter, TypedValue field, result converter)`` tuples.
+
+The result converter is ``None`` when protobuf already decodes the field to the right Python type.
+``java.math.BigDecimal`` is added by :func:`javaTypetoNative` on first use.
+"""
+
+
 def javaTypetoNative(java_type):
-    if java_type == 'java.math.BigDecimal':
-        return ('NUMBER', None, "number_value")
-    elif java_type == 'java.lang.Float':
-        return ('FLOAT', float, "double_value")
-    elif java_type == 'java.lang.Double':
-        return ('DOUBLE', None, "double_value")
-    elif java_type == 'java.lang.Long':
-        return ('LONG', None, "number_value")
-    elif java_type == 'java.lang.Integer':
-        return ('INTEGER', int, "number_value")
-    elif java_type == 'java.lang.Short':
-        return ('SHORT', int, "number_value")
-    elif java_type == 'java.lang.Byte':
-        return ('BYTE', Binary, "bytes_value")
-    elif java_type == 'java.lang.Boolean':
-        return ('BOOLEAN', bool, "bool_value")
-    elif java_type == 'java.lang.String':
-        return ('STRING', None, "string_value")
-    elif java_type == 'java.sql.Time':
-        return ('JAVA_SQL_TIME', time_from_java_sql_time, "number_value")
-    elif java_type == 'java.sql.Date':
-        return ('JAVA_SQL_DATE', date_from_java_sql_date, "number_value")
-    elif java_type == 'java.sql.Timestamp':
-        return ('JAVA_SQL_TIMESTAMP', datetime_from_java_sql_timestamp, "number_value")
-    elif java_type == '[B':
-        return ('BYTE_STRING', Binary, "bytes_value")
-        #elif java_type == 'org.apache.phoenix.schema.types.PhoenixArray':
-        #    return ('ARRAY', None)
-    else:
-        return ('NULL', None)
+    """Looks up how values of the given Java class are sent and received.
+
+    For unknown classes, the field is ``None`` and values are decoded with :func:`typedValueToNative`.
+    """
+    data_type = JAVA_CLASSES.get(java_type)
+    if data_type is None:
+        if java_type != 'java.math.BigDecimal':
+            return ('NULL', None, None, None)
+        # decimal is only imported once a statement actually uses a BigDecimal
+        from decimal import Decimal
+        data_type = JAVA_CLASSES[java_type] = ('BIG_DECIMAL', str, "string_value", Decimal)
+    return data_type
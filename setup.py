@@ -27,7 +27,12 @@ setup(
     include_package_data=True,
     cmdclass=cmdclass,
     zip_safe=False,
-    install_requires=['protobuf','sqlalchemy', 'future'],
+    install_requires=['protobuf','sqlalchemy', 'future', 'futures; python_version < "3"',
+                      'backports.weakref; python_version < "3"'],
+    extras_require={
+        'numpy': ['numpy'],
+        'arrow': ['pyarrow'],
+    },
     command_options={
         'build_sphinx': {
             'version': ('setup.py', version),